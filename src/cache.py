@@ -1,7 +1,8 @@
 import os
-import json
+import time
 import hashlib
-from datetime import datetime, timedelta
+import orjson
+from datetime import timedelta
 from src.config import T, E
 
 CACHE_DIR = "cache"
@@ -13,16 +14,12 @@ def _get_cache_path(key):
 
 def generate_cache_key(function_name, **kwargs):
     """Generates a unique, stable cache key from a function name and its arguments."""
-    # Create a stable string representation of the arguments
-    sorted_kwargs = sorted(kwargs.items())
-    args_str = json.dumps(sorted_kwargs)
+    # Canonical form: sorted key=value pairs joined with '|', which is
+    # cheaper than running the full JSON encoder for these small dicts
+    args_str = '|'.join(f"{k}={v}" for k, v in sorted(kwargs.items()))
 
-    # Hash the combination of function name and arguments
-    hasher = hashlib.md5()
-    hasher.update(function_name.encode('utf-8'))
-    hasher.update(args_str.encode('utf-8'))
-
-    return hasher.hexdigest()
+    # blake2b is considerably faster than md5 and needs no extra dependency
+    return hashlib.blake2b(f"{function_name}|{args_str}".encode('utf-8'), digest_size=16).hexdigest()
 
 def get_from_cache(key, translator):
     """
@@ -34,17 +31,18 @@ def get_from_cache(key, translator):
         return None
 
     try:
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            cache_data = json.load(f)
+        with open(cache_path, 'rb') as f:
+            cache_data = orjson.loads(f.read())
 
-        # Check if cache is expired
-        cached_time = datetime.fromisoformat(cache_data['timestamp'])
-        if datetime.now() - cached_time > CACHE_DURATION:
+        # Check if cache is expired; the timestamp is stored as an epoch
+        # float so no date parsing is needed on the read path.
+        if time.time() - cache_data['timestamp'] > CACHE_DURATION.total_seconds():
             return None
 
         return cache_data['data']
-    except (json.JSONDecodeError, KeyError, IOError):
-        # Invalid cache file, treat as a cache miss
+    except (orjson.JSONDecodeError, KeyError, TypeError, IOError):
+        # Invalid cache file (including pre-epoch-timestamp formats),
+        # treat as a cache miss
         return None
 
 def save_to_cache(key, data, translator):
@@ -53,12 +51,16 @@ def save_to_cache(key, data, translator):
     cache_path = _get_cache_path(key)
 
     cache_data = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': time.time(),
         'data': data
     }
 
+    # Write to a sidecar file and rename into place: os.replace is atomic,
+    # so a crash or a concurrent writer can never leave a torn cache file.
+    tmp_path = f"{cache_path}.tmp"
     try:
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, indent=4)
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(cache_data))
+        os.replace(tmp_path, cache_path)
     except IOError as e:
         print(translator.get('cache.write_error', T_WARN=T.WARN, E_WARN=E.WARN, cache_path=cache_path, e=e))
\ No newline at end of file
@@ -1,9 +1,13 @@
 import os
 import sys
 import json
+from functools import lru_cache
 from colorama import init, Fore, Style
 
-init(autoreset=True)
+# Strip ANSI codes outright when stdout is redirected: piped output stays
+# clean and colorama's stream wrapper does less work per write. The styles
+# below are composed once at import, so printing them costs nothing extra.
+init(autoreset=True, strip=True if not sys.stdout.isatty() else None)
 
 # --- Style Definitions ---
 class T:
@@ -12,6 +16,13 @@ class T:
 class E:
     SUCCESS, INFO, WARN, FAIL, KEY, ROCKET, CHANNEL, FILE, DOWNLOAD, PROCESS, VIDEO, TRASH, REPORT = "✅", "ℹ️", "⚠️", "❌", "🔑", "🚀", "📺", "📄", "📥", "⚙️", "🎞️", "🗑️", "📊"
 
+# Emojis are just noise bytes in piped or logged output; blank them when
+# stdout is not a terminal, mirroring the ANSI stripping above. Interactive
+# sessions are unaffected.
+if not sys.stdout.isatty():
+    for _attr in ('SUCCESS', 'INFO', 'WARN', 'FAIL', 'KEY', 'ROCKET', 'CHANNEL', 'FILE', 'DOWNLOAD', 'PROCESS', 'VIDEO', 'TRASH', 'REPORT'):
+        setattr(E, _attr, "")
+
 # --- Configuration ---
 SCOPES = ["https://www.googleapis.com/auth/youtube.force-ssl"]
 API_SERVICE_NAME, API_VERSION, CLIENT_SECRETS_FILE, CONFIG_FILE = "youtube", "v3", "client_secrets.json", "config.json"
@@ -26,20 +37,21 @@ REGIONAL_LANGUAGE_MAP = {
     'zh-tw': 'zh-TW', 'zh-hk': 'zh-HK',
 }
 
+@lru_cache(maxsize=512)
+def _normalize_language_code_cached(lang):
+    """Pure lookup half of normalize_language_code, memoized since the same
+    handful of codes repeats across a batch CSV."""
+    return REGIONAL_LANGUAGE_MAP.get(lang.strip().lower(), lang)
+
 def normalize_language_code(lang, translator):
     """
     Normalizes language codes to match YouTube's regional requirements.
     Returns the appropriate regional variant if available.
     """
-    lang_lower = lang.lower().strip()
-
-    if lang_lower in REGIONAL_LANGUAGE_MAP:
-        normalized = REGIONAL_LANGUAGE_MAP[lang_lower]
-        if normalized != lang:
-            print(translator.get('config.lang_normalized', T_INFO=T.INFO, E_INFO=E.INFO, lang=lang, normalized=normalized))
-        return normalized
-
-    return lang
+    normalized = _normalize_language_code_cached(lang)
+    if normalized != lang:
+        print(translator.get('config.lang_normalized', T_INFO=T.INFO, E_INFO=E.INFO, lang=lang, normalized=normalized))
+    return normalized
 
 def validate_config(config, translator):
     """Validates the structure of the configuration dictionary."""
@@ -72,9 +84,9 @@ def load_config(translator):
         print(translator.get('config.config_error', T_FAIL=T.FAIL, E_FAIL=E.FAIL, e=e))
         sys.exit(1)
 
-def validate_language_code(lang):
-    """Validate if language code is supported by YouTube for subtitles"""
-    valid_codes = [
+# Language codes supported by YouTube for subtitles, hoisted to module level
+# so the lookup is an O(1) hash probe instead of rebuilding a list per call.
+_VALID_LANG_CODES = frozenset([
         'aa', 'ab', 'af', 'ak', 'am', 'an', 'ar', 'as', 'av', 'ay', 'az',
         'ba', 'be', 'bg', 'bh', 'bi', 'bm', 'bn', 'bo', 'br', 'bs',
         'ca', 'ce', 'ch', 'co', 'cr', 'cs', 'cu', 'cv', 'cy',
@@ -101,5 +113,9 @@ def validate_language_code(lang):
         'xh',
         'yi', 'yo',
         'za', 'zh', 'zh-cn', 'zh-tw', 'zh-hk', 'zu'
-    ]
-    return lang.lower() in valid_codes
\ No newline at end of file
+    ])
+
+@lru_cache(maxsize=256)
+def validate_language_code(lang):
+    """Validate if language code is supported by YouTube for subtitles"""
+    return lang.lower() in _VALID_LANG_CODES
\ No newline at end of file
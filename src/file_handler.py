@@ -1,48 +1,105 @@
 import os
-import json
-import pandas as pd
+import re
+import csv
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 from googleapiclient.errors import HttpError
 from src.config import T, E
 from datetime import datetime, timezone
+from src.quota import QUOTA_COSTS, DAILY_QUOTA_LIMIT, get_total_quota_usage
 from src.youtube_api import (
     get_channel_videos,
     upload_caption,
     update_caption,
     delete_caption,
-    list_captions
+    list_captions,
+    list_captions_batch
 )
 
+# Worker count for the sync action phase; uploads and deletes for different
+# (video, language) pairs are independent, so they can overlap in flight.
+SYNC_MAX_WORKERS = 8
+
+# DELETE rows from a batch CSV are independent ~200-500ms round-trips, so a
+# few can overlap; uploads and updates stay sequential because they stream
+# file bodies and carry much higher quota costs.
+CSV_DELETE_WORKERS = 5
+
+# Sentinel for entries that have never been synced, built once instead of
+# per subtitle inside the sync analysis loop.
+_EPOCH_MIN = datetime.min.replace(tzinfo=timezone.utc)
+
+# Which API call each CSV action translates to, for pre-run cost estimates.
+_ACTION_API_CALLS = {'UPLOAD': 'captions.insert', 'UPDATE': 'captions.update', 'DELETE': 'captions.delete'}
+
+_VALID_ACTIONS = frozenset(_ACTION_API_CALLS)
+
+def _write_project_data(subtitles_json_path, project_data):
+    """
+    Persists project state atomically: the orjson payload goes to a sidecar
+    file that is renamed into place, so a crash mid-write can never leave a
+    torn subtitles.json behind. OPT_INDENT_2 keeps the file readable for
+    manual inspection.
+    """
+    tmp_path = f"{subtitles_json_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(project_data, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, subtitles_json_path)
+
+# Old flat-layout subtitle files are 'VIDEOID_LANG.srt' with the video id
+# taken before the first underscore, matched in one pass instead of
+# splitext + split inside a try/except.
+_OLD_LAYOUT_RE = re.compile(r'^([^_]+)_(.+)\.srt$')
+
 def download_channel_captions_to_csv(youtube, channel_id, channel_nickname, translator):
     """Creates a CSV file with subtitle information for batch processing."""
     csv_path = f"captions_{channel_nickname}.csv"
     print(translator.get('file_handler.download_start', T_INFO=T.INFO, E_DOWNLOAD=E.DOWNLOAD))
 
     videos = get_channel_videos(youtube, channel_id, translator)
-    all_captions_data = []
 
-    for i, video in enumerate(videos):
-        video_id, video_title = video['id'], video['title']
-        print(translator.get('file_handler.processing_video', T_INFO=T.INFO, E_PROCESS=E.PROCESS, i=i+1, len_videos=len(videos), video_title=video_title[:50]))
-        try:
-            response = list_captions(youtube, video_id, translator)
+    print(translator.get('file_handler.batch_fetch', T_INFO=T.INFO, E_DOWNLOAD=E.DOWNLOAD, len_videos=len(videos)))
+    # Videos flagged caption-less by get_channel_videos skip captions.list
+    # entirely; the row loop below already writes an empty row when a video
+    # has no batch response.
+    responses, errors = list_captions_batch(youtube, [v['id'] for v in videos if v.get('has_captions', True)], translator)
+
+    # With warm caches this loop is I/O-bound on the terminal, so progress
+    # is reported at most ~100 times regardless of channel size.
+    n_videos = len(videos)
+    print_every = max(1, n_videos // 100)
+
+    # Stream each row straight to disk instead of accumulating everything
+    # in memory just to hand it to pandas for serialization.
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['video_id', 'video_title', 'caption_id', 'language', 'action', 'file_path'])
+        writer.writeheader()
+
+        for i, video in enumerate(videos):
+            video_id, video_title = video['id'], video['title']
+            if i % print_every == 0 or i == n_videos - 1:
+                print(translator.get('file_handler.processing_video', T_INFO=T.INFO, E_PROCESS=E.PROCESS, i=i+1, len_videos=n_videos, video_title=video_title[:50]))
+            if video_id in errors:
+                e = errors[video_id]
+                print(translator.get('file_handler.http_error_video', T_WARN=T.WARN, E_WARN=E.WARN, code=e.code, reason=e.reason))
+                writer.writerow({
+                    'video_id': video_id, 'video_title': video_title, 'caption_id': 'ERROR_FETCHING',
+                    'language': '', 'action': '', 'file_path': ''
+                })
+                continue
+
+            response = responses.get(video_id, {})
             if not response.get('items'):
-                all_captions_data.append({'video_id': video_id, 'video_title': video_title, 'caption_id': '', 'language': '', 'action': '', 'file_path': ''})
+                writer.writerow({'video_id': video_id, 'video_title': video_title, 'caption_id': '', 'language': '', 'action': '', 'file_path': ''})
             else:
                 for idx, caption in enumerate(response['items']):
                     title_to_use = video_title if idx == 0 else ''
-                    all_captions_data.append({
+                    writer.writerow({
                         'video_id': video_id, 'video_title': title_to_use, 'caption_id': caption['id'],
                         'language': caption['snippet']['language'], 'action': '', 'file_path': ''
                     })
-        except HttpError as e:
-            print(translator.get('file_handler.http_error_video', T_WARN=T.WARN, E_WARN=E.WARN, code=e.code, reason=e.reason))
-            all_captions_data.append({
-                'video_id': video_id, 'video_title': video_title, 'caption_id': 'ERROR_FETCHING',
-                'language': '', 'action': '', 'file_path': ''
-            })
 
-    df = pd.DataFrame(all_captions_data, columns=['video_id', 'video_title', 'caption_id', 'language', 'action', 'file_path'])
-    df.to_csv(csv_path, index=False, encoding='utf-8')
     print(translator.get('file_handler.download_success', T_OK=T.OK, E_SUCCESS=E.SUCCESS, csv_path=csv_path))
 
 def generate_wide_report(youtube, channel_id, channel_nickname, translator):
@@ -53,58 +110,93 @@ def generate_wide_report(youtube, channel_id, channel_nickname, translator):
     videos = get_channel_videos(youtube, channel_id, translator)
     all_videos_data, all_languages = [], set()
 
+    print(translator.get('file_handler.batch_fetch', T_INFO=T.INFO, E_DOWNLOAD=E.DOWNLOAD, len_videos=len(videos)))
+    responses, errors = list_captions_batch(youtube, [v['id'] for v in videos if v.get('has_captions', True)], translator)
+
+    n_videos = len(videos)
+    print_every = max(1, n_videos // 100)
+
     for i, video in enumerate(videos):
         video_id, video_title = video['id'], video['title']
-        print(translator.get('file_handler.processing_video', T_INFO=T.INFO, E_PROCESS=E.PROCESS, i=i+1, len_videos=len(videos), video_title=video_title[:50]))
+        if i % print_every == 0 or i == n_videos - 1:
+            print(translator.get('file_handler.processing_video', T_INFO=T.INFO, E_PROCESS=E.PROCESS, i=i+1, len_videos=n_videos, video_title=video_title[:50]))
         video_row = {'video_id': video_id, 'video_title': video_title}
-        try:
-            response = list_captions(youtube, video_id, translator)
-            if response.get('items'):
-                for caption in response['items']:
-                    lang = caption['snippet']['language']
-                    all_languages.add(lang)
-                    video_row[f'caption_id_{lang}'] = caption['id']
-        except HttpError as e:
+        if video_id in errors:
+            e = errors[video_id]
             print(translator.get('file_handler.http_error_video', T_WARN=T.WARN, E_WARN=E.WARN, code=e.code, reason=e.reason))
+        else:
+            response = responses.get(video_id, {})
+            for caption in response.get('items', []):
+                lang = caption['snippet']['language']
+                all_languages.add(lang)
+                video_row[f'caption_id_{lang}'] = caption['id']
         all_videos_data.append(video_row)
 
     if not all_videos_data:
         print(translator.get('file_handler.report_no_videos', T_WARN=T.WARN, E_WARN=E.WARN)); return
 
+    # The full column set is only known once every video has been seen, so
+    # the rows are buffered and written in one streaming pass here.
     columns = ['video_id', 'video_title'] + sorted([f'caption_id_{lang}' for lang in all_languages])
-    df = pd.DataFrame(all_videos_data, columns=columns)
-    df.to_csv(report_path, index=False, encoding='utf-8')
+    with open(report_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval='')
+        writer.writeheader()
+        writer.writerows(all_videos_data)
     print(translator.get('file_handler.report_success', T_OK=T.OK, E_SUCCESS=E.SUCCESS, report_path=report_path))
 
 def process_csv_batch(youtube, csv_path, translator):
     """Processes subtitle operations from a CSV file."""
     if not os.path.exists(csv_path): raise FileNotFoundError(f"CSV file not found at '{csv_path}'")
     print(translator.get('file_handler.process_start', T_INFO=T.INFO, E_PROCESS=E.PROCESS, csv_path=csv_path))
-    df = pd.read_csv(csv_path)
-    actions_df = df[df['action'].notna()].copy()
-    actions_df['action'] = actions_df['action'].str.strip().str.upper()
 
-    if actions_df.empty:
+    # Plain csv.DictReader is all this path needs; it avoids boxing every
+    # row into a pandas Series just to read a handful of string fields.
+    with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+        # Normalize the action once while filtering so the dispatch loop
+        # below does no further string work on it. Unknown actions are
+        # counted here and reported in one summary line instead of a
+        # per-row warning.
+        action_rows, invalid_counts = [], {}
+        for line_num, row in enumerate(csv.DictReader(f), start=2):
+            action = (row.get('action') or '').strip().upper()
+            if action in _VALID_ACTIONS:
+                action_rows.append((line_num, action, row))
+            elif action:
+                invalid_counts[action] = invalid_counts.get(action, 0) + 1
+
+    if invalid_counts:
+        print(translator.get('file_handler.skipping_summary', T_WARN=T.WARN, E_WARN=E.WARN,
+                             n_rows=sum(invalid_counts.values()), actions=', '.join(sorted(invalid_counts))))
+
+    if not action_rows:
         print(translator.get('file_handler.process_no_actions', T_WARN=T.WARN, E_WARN=E.WARN)); return
 
-    for index, row in actions_df.iterrows():
-        action = row.get('action', '')
-        video_id = row.get('video_id', '')
-        lang = row.get('language', '')
-        file_path = row.get('file_path', '')
-        caption_id = row.get('caption_id', '')
+    # Running out of quota mid-batch leaves the CSV half-applied with no
+    # record of where it stopped, so refuse up front when the whole batch
+    # cannot fit in what is left of today's budget.
+    estimated_cost = sum(QUOTA_COSTS.get(_ACTION_API_CALLS.get(action, ''), 0) for _, action, _ in action_rows)
+    remaining = DAILY_QUOTA_LIMIT - get_total_quota_usage()
+    print(translator.get('file_handler.quota_estimate', T_INFO=T.INFO, E_KEY=E.KEY, estimated_cost=estimated_cost, remaining=remaining))
+    if estimated_cost > remaining:
+        print(translator.get('file_handler.quota_exceeded', T_FAIL=T.FAIL, E_FAIL=E.FAIL, estimated_cost=estimated_cost, remaining=remaining))
+        return
+
+    def _process_row(action_row):
+        line_num, action, row = action_row
+        video_id = row.get('video_id') or ''
+        lang = row.get('language') or ''
+        file_path = row.get('file_path') or ''
+        caption_id = row.get('caption_id') or ''
 
-        print(translator.get('file_handler.process_row_header', T_HEADER=T.HEADER, index=index+2, action=action, video_id=video_id))
+        print(translator.get('file_handler.process_row_header', T_HEADER=T.HEADER, index=line_num, action=action, video_id=video_id))
 
         try:
             if action == 'UPLOAD':
-                upload_caption(youtube, video_id, str(lang), str(file_path), translator)
+                upload_caption(youtube, video_id, lang, file_path, translator)
             elif action == 'UPDATE':
-                update_caption(youtube, video_id, str(lang), str(file_path), translator, caption_id=caption_id)
+                update_caption(youtube, video_id, lang, file_path, translator, caption_id=caption_id)
             elif action == 'DELETE':
-                delete_caption(youtube, str(caption_id), translator)
-            else:
-                print(translator.get('file_handler.skipping_action', T_WARN=T.WARN, E_WARN=E.WARN, action=action))
+                delete_caption(youtube, caption_id, translator)
         except FileNotFoundError as e:
             print(translator.get('file_handler.file_not_found', T_FAIL=T.FAIL, E_FAIL=E.FAIL, e=e))
         except PermissionError as e:
@@ -114,6 +206,15 @@ def process_csv_batch(youtube, csv_path, translator):
         except Exception as e:
             print(translator.get('file_handler.unexpected_error', T_FAIL=T.FAIL, E_FAIL=E.FAIL, e=e))
 
+    delete_rows = [r for r in action_rows if r[1] == 'DELETE']
+    for action_row in action_rows:
+        if action_row[1] != 'DELETE':
+            _process_row(action_row)
+
+    if delete_rows:
+        with ThreadPoolExecutor(max_workers=CSV_DELETE_WORKERS) as executor:
+            list(executor.map(_process_row, delete_rows))
+
 def create_project(youtube, channel_id, project_name, translator):
     """Creates a new project directory and populates it with subtitle data."""
     project_path = os.path.join("projects", project_name)
@@ -128,14 +229,25 @@ def create_project(youtube, channel_id, project_name, translator):
     videos = get_channel_videos(youtube, channel_id, translator)
     project_data = {}
 
+    print(translator.get('file_handler.batch_fetch', T_INFO=T.INFO, E_DOWNLOAD=E.DOWNLOAD, len_videos=len(videos)))
+    responses, errors = list_captions_batch(youtube, [v['id'] for v in videos if v.get('has_captions', True)], translator)
+
+    n_videos = len(videos)
+    print_every = max(1, n_videos // 100)
+
     for i, video in enumerate(videos):
         video_id, video_title = video['id'], video['title']
-        print(translator.get('file_handler.processing_video', T_INFO=T.INFO, E_PROCESS=E.PROCESS, i=i+1, len_videos=len(videos), video_title=video_title[:50]))
+        if i % print_every == 0 or i == n_videos - 1:
+            print(translator.get('file_handler.processing_video', T_INFO=T.INFO, E_PROCESS=E.PROCESS, i=i+1, len_videos=n_videos, video_title=video_title[:50]))
 
         video_data = { "title": video_title, "subtitles": {} }
 
-        try:
-            response = list_captions(youtube, video_id, translator)
+        if video_id in errors:
+            e = errors[video_id]
+            print(translator.get('project.http_error_video', T_WARN=T.WARN, E_WARN=E.WARN, code=e.code, video_id=video_id, reason=e.reason))
+            video_data["error"] = f"HTTP {e.code}: {e.reason}"
+        else:
+            response = responses.get(video_id, {})
             for caption in response.get('items', []):
                 lang = caption['snippet']['language']
                 video_data["subtitles"][lang] = {
@@ -143,15 +255,11 @@ def create_project(youtube, channel_id, project_name, translator):
                     "is_draft": caption['snippet'].get('isDraft'), "local_path": "",
                     "last_sync": None, "status": "synced"
                 }
-        except HttpError as e:
-            print(translator.get('project.http_error_video', T_WARN=T.WARN, E_WARN=E.WARN, code=e.code, video_id=video_id, reason=e.reason))
-            video_data["error"] = f"HTTP {e.code}: {e.reason}"
 
         project_data[video_id] = video_data
 
     subtitles_json_path = os.path.join(project_path, "subtitles.json")
-    with open(subtitles_json_path, 'w', encoding='utf-8') as f:
-        json.dump(project_data, f, indent=4, ensure_ascii=False)
+    _write_project_data(subtitles_json_path, project_data)
 
     print(translator.get('project.create_success', T_OK=T.OK, E_SUCCESS=E.SUCCESS, project_name=project_name))
     print(translator.get('project.data_saved', T_INFO=T.INFO, E_FILE=E.FILE, subtitles_json_path=subtitles_json_path))
@@ -165,14 +273,17 @@ def sync_project(youtube, project_name, channel_nickname, translator):
         print(translator.get('project.not_found', T_FAIL=T.FAIL, E_FAIL=E.FAIL, project_name=project_name))
         return
 
-    with open(subtitles_json_path, 'r', encoding='utf-8') as f:
-        project_data = json.load(f)
+    with open(subtitles_json_path, 'rb') as f:
+        project_data = orjson.loads(f.read())
 
     print(translator.get('sync.header', T_HEADER=T.HEADER, E_PROCESS=E.PROCESS, project_name=project_name))
     print(translator.get('sync.scanning', T_INFO=T.INFO))
 
     local_files = {}
     for root, _, files in os.walk(project_path):
+        # The parent directory is a per-directory property, not a per-file
+        # one, so resolve it once before scanning the directory's files.
+        parent_dir = os.path.basename(root)
         for file in files:
             if not file.endswith(".srt"):
                 continue
@@ -181,7 +292,6 @@ def sync_project(youtube, project_name, channel_nickname, translator):
             full_path = os.path.join(root, file)
 
             # Strategy 1: New structure (projects/my_project/VIDEO_ID/LANG.srt)
-            parent_dir = os.path.basename(root)
             if parent_dir in project_data:
                 video_id = parent_dir
                 lang = os.path.splitext(file)[0]
@@ -192,15 +302,11 @@ def sync_project(youtube, project_name, channel_nickname, translator):
 
             # Strategy 2: Old structure (projects/my_project/VIDEO_ID_LANG.srt)
             if root == project_path:
-                try:
-                    video_id, lang = os.path.splitext(file)[0].split('_', 1)
-                    if video_id in project_data:
-                        # Add only if not already found via the new structure.
-                        if (video_id, lang) not in local_files:
-                            local_files[(video_id, lang)] = full_path
-                    else:
-                        print(translator.get('sync.invalid_format', T_WARN=T.WARN, file=file))
-                except ValueError:
+                match = _OLD_LAYOUT_RE.match(file)
+                if match and match.group(1) in project_data:
+                    # Add only if not already found via the new structure.
+                    local_files.setdefault((match.group(1), match.group(2)), full_path)
+                else:
                     print(translator.get('sync.invalid_format', T_WARN=T.WARN, file=file))
 
     actions_to_perform = []
@@ -211,7 +317,7 @@ def sync_project(youtube, project_name, channel_nickname, translator):
                 local_path = local_files.pop(file_key)
                 sub_info['local_path'] = local_path
 
-                last_sync_time = datetime.fromisoformat(sub_info['last_sync']) if sub_info.get('last_sync') else datetime.min.replace(tzinfo=timezone.utc)
+                last_sync_time = datetime.fromisoformat(sub_info['last_sync']) if sub_info.get('last_sync') else _EPOCH_MIN
                 local_mod_time = datetime.fromtimestamp(os.path.getmtime(local_path)).astimezone(timezone.utc)
 
                 if local_mod_time > last_sync_time:
@@ -230,33 +336,50 @@ def sync_project(youtube, project_name, channel_nickname, translator):
             actions_to_perform.append(('upload', video_id, lang, sub_info))
 
     print(translator.get('sync.analyzing', T_INFO=T.INFO))
-    for action, video_id, lang, sub_info in actions_to_perform:
+
+    # Guards the shared project_data tree while workers record results.
+    project_lock = threading.Lock()
+
+    # One timestamp for the whole run; every action synced in this pass
+    # records the same last_sync instant.
+    now_iso = datetime.now(timezone.utc).isoformat()
+
+    def _perform_action(planned_action):
+        action, video_id, lang, sub_info = planned_action
         try:
             if action == 'upload':
                 print(translator.get('sync.uploading', T_INFO=T.INFO, E_ROCKET=E.ROCKET, video_id=video_id, lang=lang))
                 response = upload_caption(youtube, video_id, lang, sub_info['local_path'], translator)
-                sub_info.update({
-                    'caption_id': response['id'], 'status': 'synced',
-                    'last_sync': datetime.now(timezone.utc).isoformat(),
-                    'last_updated': response['snippet']['lastUpdated']
-                })
+                with project_lock:
+                    sub_info.update({
+                        'caption_id': response['id'], 'status': 'synced',
+                        'last_sync': now_iso,
+                        'last_updated': response['snippet']['lastUpdated']
+                    })
             elif action == 'update':
                 print(translator.get('sync.updating', T_INFO=T.INFO, E_PROCESS=E.PROCESS, video_id=video_id, lang=lang))
                 response = update_caption(youtube, video_id, lang, sub_info['local_path'], translator, caption_id=sub_info['caption_id'])
-                sub_info.update({
-                    'status': 'synced', 'last_sync': datetime.now(timezone.utc).isoformat(),
-                    'last_updated': response['snippet']['lastUpdated']
-                })
+                with project_lock:
+                    sub_info.update({
+                        'status': 'synced', 'last_sync': now_iso,
+                        'last_updated': response['snippet']['lastUpdated']
+                    })
             elif action == 'delete':
                 print(translator.get('sync.deleting', T_INFO=T.INFO, E_TRASH=E.TRASH, video_id=video_id, lang=lang))
                 delete_caption(youtube, sub_info['caption_id'], translator)
-                del project_data[video_id]['subtitles'][lang]
+                with project_lock:
+                    del project_data[video_id]['subtitles'][lang]
         except Exception as e:
             print(translator.get('sync.failed_action', T_FAIL=T.FAIL, E_FAIL=E.FAIL, action=action, video_id=video_id, lang=lang, e=e))
             sub_info['status'] = f'error: {e}'
 
+    if actions_to_perform:
+        with ThreadPoolExecutor(max_workers=SYNC_MAX_WORKERS) as executor:
+            # list() drains the iterator so every action finishes (and any
+            # worker-side surprises surface) before the project file is saved.
+            list(executor.map(_perform_action, actions_to_perform))
+
     print(translator.get('sync.saving', T_INFO=T.INFO))
-    with open(subtitles_json_path, 'w', encoding='utf-8') as f:
-        json.dump(project_data, f, indent=4, ensure_ascii=False)
+    _write_project_data(subtitles_json_path, project_data)
 
     print(translator.get('sync.complete', T_OK=T.OK, E_SUCCESS=E.SUCCESS, project_name=project_name))
\ No newline at end of file
@@ -6,6 +6,10 @@ class Translator:
     def __init__(self, language='en'):
         self.language = language
         self.translations = self._load_translations()
+        # Flattened 'section.key' -> string view of the nested translations,
+        # built once so get() is a single dict lookup instead of a key split
+        # and nested-dict walk on every call.
+        self._flat = self._flatten(self.translations)
 
     def _load_translations(self):
         """Loads the translation file for the selected language."""
@@ -25,22 +29,32 @@ class Translator:
             print(f"{T.FAIL}{E.FAIL} Failed to load language file {locale_path}: {e}")
             return {}
 
+    def _flatten(self, translations, prefix=''):
+        """Flattens the nested translation dict into dotted-key form."""
+        flat = {}
+        for k, v in translations.items():
+            full_key = f"{prefix}{k}"
+            if isinstance(v, dict):
+                flat.update(self._flatten(v, f"{full_key}."))
+            else:
+                flat[full_key] = v
+        return flat
+
     def get(self, key, **kwargs):
         """
         Retrieves a translated string by its key and formats it with provided arguments.
         Falls back to the key itself if the translation is not found.
         """
-        # Navigate nested keys if necessary
-        keys = key.split('.')
-        value = self.translations
+        value = self._flat.get(key)
+        if value is None:
+            # Fallback to the key itself if not found
+            return key
+        if not kwargs:
+            return value
         try:
-            for k in keys:
-                value = value[k]
-
-            # Perform formatting if arguments are provided
-            return value.format(**kwargs)
+            # format_map skips rebuilding the kwargs into a second dict
+            return value.format_map(kwargs)
         except KeyError:
-            # Fallback to the key itself if not found
             return key
         except Exception as e:
             print(f"{T.WARN}    {E.WARN} Translation formatting error for key '{key}': {e}")
@@ -1,6 +1,8 @@
 import sys
 import os
+import re
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from src.config import T, E, load_config
 from src.youtube_api import get_authenticated_service, upload_caption
 from src.quota import display_quota_usage
@@ -13,6 +15,16 @@ from src.file_handler import (
     sync_project,
 )
 
+# Smart-upload files are independent uploads to the same video, so a few can
+# be in flight at once; kept low because each insert costs 400 quota units.
+SMART_UPLOAD_WORKERS = 4
+
+# Smart-upload filenames are 'VIDEOID_LANGUAGE.ext' with the language taken
+# after the last underscore, mirroring the old splitext+rsplit parsing in a
+# single compiled match. The language must start with a non-dot character so
+# an empty language ('video_.srt') cannot swallow the extension and pass.
+_SMART_UPLOAD_RE = re.compile(r'^(?P<video_id>.+)_(?P<language>[^_.][^_]*?)(?:\.[^.]*)?$')
+
 def show_help(translator):
     """Displays the main help message."""
     print(rf"""
@@ -47,7 +59,7 @@ def main():
         show_help(translator)
         sys.exit(0)
 
-    config = load_config()
+    config = load_config(translator)
     parser = argparse.ArgumentParser(description=translator.get('args.description'))
     parser.add_argument("-c", "--channel", required=True, choices=config['channels'].keys(), help=translator.get('args.channel'))
     parser.add_argument("-l", "--language", default='en', help="Set the display language (e.g., 'en', 'es').")
@@ -98,24 +110,42 @@ def main():
             print(translator.get('smart_upload.validating'))
             target_video_id, files_to_upload = None, []
             for file_path in args.file_paths:
-                if not os.path.exists(file_path): raise FileNotFoundError(translator.get('smart_upload.file_not_found', file_path=file_path))
-                if not os.access(file_path, os.R_OK):raise PermissionError(translator.get('smart_upload.permission_denied', file_path=file_path))
+                # stat() answers existence in one syscall; readability has
+                # to come from os.access, which asks the kernel about this
+                # process rather than approximating from the mode bits.
+                try:
+                    os.stat(file_path)
+                except OSError:
+                    raise FileNotFoundError(translator.get('smart_upload.file_not_found', file_path=file_path))
+                if not os.access(file_path, os.R_OK): raise PermissionError(translator.get('smart_upload.permission_denied', file_path=file_path))
                 basename = os.path.basename(file_path)
-                filename_no_ext, _ = os.path.splitext(basename)
-                parts = filename_no_ext.rsplit('_', 1)
-                if len(parts) != 2 or not parts[0] or not parts[1]: raise ValueError(translator.get('smart_upload.invalid_format', basename=basename))
-                video_id, language = parts
+                match = _SMART_UPLOAD_RE.match(basename)
+                if not match: raise ValueError(translator.get('smart_upload.invalid_format', basename=basename))
+                video_id, language = match.group('video_id'), match.group('language')
                 if target_video_id is None:
                     target_video_id = video_id
                     print(translator.get('smart_upload.video_id_set', E_VIDEO=E.VIDEO, target_video_id=target_video_id))
                 elif video_id != target_video_id:
                     raise ValueError(translator.get('smart_upload.mismatched_id', target_video_id=target_video_id, basename=basename, video_id=video_id))
-                files_to_upload.append({'path': file_path, 'id': video_id, 'lang': language})
+                # Plain tuples: every entry has the same three fields, so
+                # there is no need to allocate a dict per file.
+                files_to_upload.append((file_path, video_id, language))
             print(translator.get('smart_upload.validation_success', E_SUCCESS=E.SUCCESS))
-            print(translator.get('smart_upload.starting_uploads', len_files_to_upload=len(files_to_upload)))
-            for i, file_info in enumerate(files_to_upload):
-                print(f"{T.INFO}   ({i+1}/{len(files_to_upload)}) ", end="")
-                upload_caption(youtube_service, file_info['id'], file_info['lang'], file_info['path'], translator)
+            n_files = len(files_to_upload)
+            print(translator.get('smart_upload.starting_uploads', len_files_to_upload=n_files))
+
+            def _upload_one(indexed_file):
+                i, (path, video_id, lang) = indexed_file
+                # A complete line per file: with workers printing in
+                # parallel, a dangling "(i/n) " prefix would attach itself
+                # to whichever thread prints next.
+                print(f"{T.INFO}   ({i+1}/{n_files}) {os.path.basename(path)}")
+                upload_caption(youtube_service, video_id, lang, path, translator)
+
+            # Each language track uploads independently, so overlap a few
+            # instead of paying one full round-trip per file.
+            with ThreadPoolExecutor(max_workers=SMART_UPLOAD_WORKERS) as executor:
+                list(executor.map(_upload_one, enumerate(files_to_upload)))
             print(translator.get('smart_upload.complete', E_SUCCESS=E.SUCCESS))
 
     except Exception as e:
@@ -1,11 +1,21 @@
+import threading
+
 from src.config import T, E
 
 _QUOTA_USAGE = 0
 
+# Batch callbacks and sync workers increment from several threads; unguarded
+# += on the module global would silently lose updates.
+_QUOTA_LOCK = threading.Lock()
+
+# Default daily allowance for a YouTube Data API project.
+DAILY_QUOTA_LIMIT = 10000
+
 # Based on https://developers.google.com/youtube/v3/determine_quota_cost
 QUOTA_COSTS = {
     'channels.list': 1,
     'playlistItems.list': 1,
+    'videos.list': 1,
     'captions.list': 50,
     'captions.insert': 400,
     'captions.update': 450,
@@ -17,8 +27,10 @@ def increment_quota(api_call_name, translator):
     global _QUOTA_USAGE
     cost = QUOTA_COSTS.get(api_call_name, 0)
     if cost > 0:
-        _QUOTA_USAGE += cost
-        print(translator.get('quota.increment', T_INFO=T.INFO, E_KEY=E.KEY, cost=cost, api_call_name=api_call_name, total_usage=_QUOTA_USAGE))
+        with _QUOTA_LOCK:
+            _QUOTA_USAGE += cost
+            total_usage = _QUOTA_USAGE
+        print(translator.get('quota.increment', T_INFO=T.INFO, E_KEY=E.KEY, cost=cost, api_call_name=api_call_name, total_usage=total_usage))
 
 def get_total_quota_usage():
     """Returns the total estimated quota usage for the session."""
@@ -1,5 +1,11 @@
 import os
-import pandas as pd
+import time
+import random
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import httplib2
+import google_auth_httplib2
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
@@ -14,16 +20,121 @@ from src.config import (
 from src.cache import generate_cache_key, get_from_cache, save_to_cache
 from src.quota import increment_quota
 
+# The YouTube batch endpoint accepts at most 50 calls per HTTP request.
+BATCH_REQUEST_SIZE = 50
+
+# Number of batch HTTP requests kept in flight at once. Kept modest to stay
+# well under YouTube's per-minute request ceiling.
+MAX_CONCURRENT_BATCHES = 8
+
+# Partial-response selectors: the API strips everything else server-side,
+# which shrinks each page's JSON payload considerably.
+PLAYLIST_ITEMS_FIELDS = 'nextPageToken,items(snippet/resourceId/videoId,snippet/title)'
+CAPTIONS_LIST_FIELDS = 'items(id,snippet(language,lastUpdated,isDraft))'
+VIDEOS_CONTENT_DETAILS_FIELDS = 'items(id,contentDetails/caption)'
+
+# HTTP statuses worth retrying: rate limiting and transient server errors.
+RETRYABLE_STATUS_CODES = (429, 500, 503)
+MAX_RETRIES = 5
+
+# Resumable uploads are sent in bounded chunks so a transient failure only
+# retransmits one chunk and memory use stays flat for any file size.
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+class _TokenBucket:
+    """
+    Client-side request throttle shared by every API call.
+
+    Bursting until YouTube answers 403/429 wastes quota on calls that are
+    rejected and then retried; smoothing the request rate below the server's
+    ceiling avoids those rejected calls entirely. Thread-safe, since batch
+    and sync work runs on worker threads.
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a token is available, then consumes it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+# Allows short bursts of 10 requests, sustained 5 requests/second.
+_REQUEST_BUCKET = _TokenBucket(rate=5.0, capacity=10)
+
+# Credentials behind the current service, shared across worker threads. The
+# refresh lock makes token refresh single-flight: concurrent refreshes of the
+# same refresh token trigger invalid_grant and force a full re-auth.
+_SERVICE_CREDENTIALS = None
+_REFRESH_LOCK = threading.Lock()
+_THREAD_LOCAL = threading.local()
+
+def _get_thread_http():
+    """
+    Returns an AuthorizedHttp owned by the calling thread, or None before
+    authentication. httplib2.Http is not thread-safe, so each worker thread
+    gets its own transport wrapped around the shared credentials.
+    """
+    if _SERVICE_CREDENTIALS is None:
+        return None
+    http = getattr(_THREAD_LOCAL, 'http', None)
+    if http is None:
+        http = google_auth_httplib2.AuthorizedHttp(_SERVICE_CREDENTIALS, http=httplib2.Http())
+        _THREAD_LOCAL.http = http
+    return http
+
+def execute_with_retry(request, translator, max_tries=MAX_RETRIES):
+    """
+    Executes an API request, retrying transient failures.
+
+    Rate-limit (429) and transient server (500/503) errors are retried with
+    exponential backoff plus jitter so a momentary throttle does not lose a
+    whole sweep's worth of data. Any other HttpError propagates immediately.
+    """
+    http = _get_thread_http()
+    for attempt in range(max_tries):
+        _REQUEST_BUCKET.acquire()
+        try:
+            return request.execute(http=http) if http is not None else request.execute()
+        except HttpError as e:
+            if e.resp.status not in RETRYABLE_STATUS_CODES or attempt == max_tries - 1:
+                raise
+            delay = (2 ** attempt) * 0.5 + random.random() * 0.5
+            print(translator.get('youtube_api.retrying', T_WARN=T.WARN, E_WARN=E.WARN, code=e.resp.status, delay=f"{delay:.1f}"))
+            time.sleep(delay)
+
+# Refresh access tokens this long before they expire, so a token never dies
+# mid-way through a resumable upload and forces a 401-then-refresh stall.
+_TOKEN_REFRESH_SKEW = timedelta(minutes=5)
+
+def _expiring_soon(creds):
+    """True when the access token is inside the preemptive-refresh window."""
+    # google credentials store expiry as a naive UTC datetime.
+    return bool(creds.expiry) and creds.expiry - datetime.utcnow() < _TOKEN_REFRESH_SKEW
+
 def get_authenticated_service(channel_nickname, translator):
     token_file = f"token_{channel_nickname}.json"
     creds = None
     if os.path.exists(token_file):
         creds = Credentials.from_authorized_user_file(token_file, SCOPES)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
+    if not creds or not creds.valid or _expiring_soon(creds):
+        if creds and creds.refresh_token and (creds.expired or _expiring_soon(creds)):
             print(translator.get('youtube_api.token_expired', channel_nickname=channel_nickname, T_INFO=T.INFO, E_INFO=E.INFO))
             try:
-                creds.refresh(Request())
+                with _REFRESH_LOCK:
+                    if not creds.valid or _expiring_soon(creds):
+                        creds.refresh(Request())
             except Exception as e:
                 print(translator.get('youtube_api.token_refresh_failed', e=e, T_WARN=T.WARN, E_WARN=E.WARN))
                 os.remove(token_file); creds = None
@@ -31,10 +142,22 @@ def get_authenticated_service(channel_nickname, translator):
             print(translator.get('youtube_api.no_valid_token', channel_nickname=channel_nickname, T_WARN=T.WARN, E_KEY=E.KEY))
             flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRETS_FILE, SCOPES)
             creds = flow.run_local_server(port=0)
-        with open(token_file, 'w') as token:
+        # Atomic rename so a crash mid-write cannot corrupt the stored token,
+        # which would force a full browser re-auth on the next run.
+        tmp_token_file = f"{token_file}.tmp"
+        with open(tmp_token_file, 'w') as token:
             token.write(creds.to_json())
-            print(translator.get('youtube_api.auth_success', token_file=token_file, T_OK=T.OK, E_SUCCESS=E.SUCCESS))
-    return build(API_SERVICE_NAME, API_VERSION, credentials=creds)
+        os.replace(tmp_token_file, token_file)
+        print(translator.get('youtube_api.auth_success', token_file=token_file, T_OK=T.OK, E_SUCCESS=E.SUCCESS))
+    global _SERVICE_CREDENTIALS
+    _SERVICE_CREDENTIALS = creds
+    try:
+        # The discovery document bundled with the client library avoids an
+        # HTTPS round-trip (~200-500ms) on every CLI invocation.
+        return build(API_SERVICE_NAME, API_VERSION, credentials=creds, static_discovery=True)
+    except TypeError:
+        # Older client libraries without static discovery support.
+        return build(API_SERVICE_NAME, API_VERSION, credentials=creds)
 
 def get_channel_videos(youtube, channel_id, translator):
     """Retrieves all videos for a channel, using a cache to avoid redundant API calls."""
@@ -47,18 +170,49 @@ def get_channel_videos(youtube, channel_id, translator):
     print(translator.get('youtube_api.fetching_videos', T_INFO=T.INFO, E_DOWNLOAD=E.DOWNLOAD))
     video_ids = []
     try:
-        res = youtube.channels().list(id=channel_id, part='contentDetails').execute()
+        res = execute_with_retry(
+            youtube.channels().list(id=channel_id, part='contentDetails',
+                                    fields='items/contentDetails/relatedPlaylists/uploads'), translator)
         increment_quota('channels.list', translator)
         playlist_id = res['items'][0]['contentDetails']['relatedPlaylists']['uploads']
 
-        next_page_token = None
-        while True:
-            res = youtube.playlistItems().list(playlistId=playlist_id, part='snippet', maxResults=50, pageToken=next_page_token).execute()
-            increment_quota('playlistItems.list', translator)
-            for item in res['items']:
-                video_ids.append({'id': item['snippet']['resourceId']['videoId'], 'title': item['snippet']['title']})
-            next_page_token = res.get('nextPageToken')
-            if not next_page_token: break
+        # Pagination is inherently sequential (each page token comes from the
+        # previous response), but the next page can be fetched while the
+        # current one is being processed to hide the round-trip latency.
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            future = prefetcher.submit(
+                execute_with_retry,
+                youtube.playlistItems().list(playlistId=playlist_id, part='snippet', maxResults=50, pageToken=None,
+                                             fields=PLAYLIST_ITEMS_FIELDS), translator)
+            while future is not None:
+                res = future.result()
+                increment_quota('playlistItems.list', translator)
+                next_page_token = res.get('nextPageToken')
+                if next_page_token:
+                    future = prefetcher.submit(
+                        execute_with_retry,
+                        youtube.playlistItems().list(playlistId=playlist_id, part='snippet', maxResults=50, pageToken=next_page_token,
+                                                     fields=PLAYLIST_ITEMS_FIELDS), translator)
+                else:
+                    future = None
+                # extend() consumes the generator inside the list object,
+                # skipping one bytecode-level append call per item.
+                video_ids.extend({'id': item['snippet']['resourceId']['videoId'], 'title': item['snippet']['title']}
+                                 for item in res['items'])
+
+        # videos.list costs 1 quota unit per 50 ids while captions.list costs
+        # 50 per video, so flagging caption-less videos here lets callers skip
+        # captions.list calls that are provably going to come back empty.
+        for start in range(0, len(video_ids), BATCH_REQUEST_SIZE):
+            chunk = video_ids[start:start + BATCH_REQUEST_SIZE]
+            res = execute_with_retry(
+                youtube.videos().list(id=','.join(v['id'] for v in chunk), part='contentDetails',
+                                      fields=VIDEOS_CONTENT_DETAILS_FIELDS), translator)
+            increment_quota('videos.list', translator)
+            caption_flags = {item['id']: item['contentDetails'].get('caption') for item in res.get('items', [])}
+            for video in chunk:
+                # Unknown ids default to True so they still get a real lookup.
+                video['has_captions'] = caption_flags.get(video['id']) != 'false'
 
         print(translator.get('youtube_api.found_videos', len_videos=len(video_ids), T_OK=T.OK))
         save_to_cache(cache_key, video_ids, translator)
@@ -67,19 +221,105 @@ def get_channel_videos(youtube, channel_id, translator):
         print(translator.get('youtube_api.http_error', e=e, T_FAIL=T.FAIL, E_FAIL=E.FAIL))
         return []
 
+# In-process layer over the disk cache: a sweep that inspects the same video
+# several times (update fallback, dry runs) re-reads and re-parses the cache
+# file each time without this.
+_CAPTION_LIST_MEM = {}
+
 def list_captions(youtube, video_id, translator):
     """
     Lists all captions for a video, using a cache to avoid redundant API calls.
     The caller is responsible for handling HttpError.
     """
+    cached_captions = _CAPTION_LIST_MEM.get(video_id)
+    if cached_captions is not None:
+        return cached_captions
+
     cache_key = generate_cache_key("list_captions", video_id=video_id)
     cached_captions = get_from_cache(cache_key, translator)
     if cached_captions is not None:
+        _CAPTION_LIST_MEM[video_id] = cached_captions
         return cached_captions
 
-    response = youtube.captions().list(part="snippet", videoId=video_id).execute()
+    response = execute_with_retry(youtube.captions().list(part="snippet", videoId=video_id, fields=CAPTIONS_LIST_FIELDS), translator)
     increment_quota('captions.list', translator)
     save_to_cache(cache_key, response, translator)
+    _CAPTION_LIST_MEM[video_id] = response
+    return response
+
+def list_captions_batch(youtube, video_ids, translator):
+    """
+    Lists captions for many videos at once using the API batch endpoint.
+
+    Groups up to BATCH_REQUEST_SIZE captions().list calls into a single HTTP
+    request, which amortizes the per-request overhead across the whole channel.
+    When more than one batch is needed, the batches are executed concurrently
+    so the round-trips overlap instead of queueing one after another.
+    Returns a tuple (responses, errors): responses maps video_id to the API
+    response, errors maps video_id to the HttpError raised for that video, so
+    one failing video does not abort the rest of the batch.
+
+    Videos whose caption list is already cached are answered from disk and
+    never added to a batch, so the same cache entries are shared with
+    list_captions and repeat runs within the cache window cost no quota.
+    """
+    responses, errors = {}, {}
+    results_lock = threading.Lock()
+
+    uncached_ids = []
+    for video_id in video_ids:
+        cache_key = generate_cache_key("list_captions", video_id=video_id)
+        cached_captions = get_from_cache(cache_key, translator)
+        if cached_captions is not None:
+            responses[video_id] = cached_captions
+        else:
+            uncached_ids.append(video_id)
+
+    def _on_response(request_id, response, exception):
+        with results_lock:
+            if exception is not None:
+                errors[request_id] = exception
+            else:
+                increment_quota('captions.list', translator)
+                save_to_cache(generate_cache_key("list_captions", video_id=request_id), response, translator)
+                responses[request_id] = response
+
+    batches = []
+    for start in range(0, len(uncached_ids), BATCH_REQUEST_SIZE):
+        batch = youtube.new_batch_http_request(callback=_on_response)
+        for video_id in uncached_ids[start:start + BATCH_REQUEST_SIZE]:
+            batch.add(youtube.captions().list(part="snippet", videoId=video_id, fields=CAPTIONS_LIST_FIELDS), request_id=video_id)
+        batches.append(batch)
+
+    if len(batches) == 1:
+        execute_with_retry(batches[0], translator)
+    elif batches:
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_BATCHES) as executor:
+            for future in [executor.submit(execute_with_retry, batch, translator) for batch in batches]:
+                future.result()
+
+    return responses, errors
+
+def _drive_resumable(request, translator):
+    """
+    Drives a resumable media request chunk by chunk and returns the API
+    response, reporting progress between chunks. Transient failures only
+    retransmit the current chunk, and memory stays flat for any file size.
+
+    Chunks go over the calling thread's transport, like execute_with_retry:
+    concurrent uploads on the service's one shared httplib2 connection would
+    interleave their framing.
+    """
+    http = _get_thread_http()
+    response = None
+    while response is None:
+        _REQUEST_BUCKET.acquire()
+        if http is not None:
+            status, response = request.next_chunk(http=http, num_retries=MAX_RETRIES - 1)
+        else:
+            status, response = request.next_chunk(num_retries=MAX_RETRIES - 1)
+        if status:
+            print(translator.get('youtube_api.upload_progress', T_INFO=T.INFO, percent=int(status.progress() * 100)))
     return response
 
 def upload_caption(youtube, video_id, language, file_path, translator):
@@ -90,8 +330,8 @@ def upload_caption(youtube, video_id, language, file_path, translator):
 
     print(translator.get('youtube_api.uploading_caption', normalized_lang=normalized_lang, file_path=file_path, T_INFO=T.INFO, E_ROCKET=E.ROCKET))
     body = {'snippet': {'videoId': video_id, 'language': normalized_lang, 'isDraft': False}}
-    media_body = MediaFileUpload(file_path, chunksize=-1, resumable=True)
-    response = youtube.captions().insert(part="snippet", body=body, media_body=media_body).execute()
+    media_body = MediaFileUpload(file_path, chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
+    response = _drive_resumable(youtube.captions().insert(part="snippet", body=body, media_body=media_body), translator)
     increment_quota('captions.insert', translator)
     print(translator.get('youtube_api.upload_success', caption_id=response['id'], T_OK=T.OK, E_SUCCESS=E.SUCCESS))
     return response
@@ -101,14 +341,15 @@ def update_caption(youtube, video_id, language, file_path, translator, caption_i
     normalized_lang = normalize_language_code(language, translator)
     print(translator.get('youtube_api.updating_caption', normalized_lang=normalized_lang, video_id=video_id, T_INFO=T.INFO, E_PROCESS=E.PROCESS))
 
-    is_valid_caption_id = pd.notna(caption_id) and str(caption_id).strip()
+    # caption_id arrives as '' from CSV rows and None from sync entries that
+    # were never uploaded; both mean "no id, search by language instead".
+    str_caption_id = str(caption_id).strip() if caption_id is not None else ''
 
-    if is_valid_caption_id:
-        str_caption_id = str(caption_id).strip()
+    if str_caption_id:
         print(translator.get('youtube_api.update_direct', caption_id=str_caption_id, T_INFO=T.INFO, E_INFO=E.INFO))
         try:
-            media_body = MediaFileUpload(file_path, chunksize=-1, resumable=True)
-            response = youtube.captions().update(part="snippet", body={'id': str_caption_id, 'snippet': {'isDraft': False}}, media_body=media_body).execute()
+            media_body = MediaFileUpload(file_path, chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
+            response = _drive_resumable(youtube.captions().update(part="snippet", body={'id': str_caption_id, 'snippet': {'isDraft': False}}, media_body=media_body), translator)
             increment_quota('captions.update', translator)
             print(translator.get('youtube_api.update_success', T_OK=T.OK, E_SUCCESS=E.SUCCESS))
             return response
@@ -120,9 +361,13 @@ def update_caption(youtube, video_id, language, file_path, translator, caption_i
 
     print(translator.get('youtube_api.searching_by_lang', normalized_lang=normalized_lang, T_INFO=T.INFO, E_INFO=E.INFO))
     caption_to_update = None
+    normalized_lang_lower = normalized_lang.lower()
     try:
         list_response = list_captions(youtube, video_id, translator)
-        caption_to_update = next((item for item in list_response.get('items', []) if item['snippet']['language'].lower() == normalized_lang.lower()), None)
+        # Index by lowered language so each caption is lowered once, rather
+        # than rescanning and re-lowering the list per lookup.
+        by_lang = {item['snippet']['language'].lower(): item for item in list_response.get('items', [])}
+        caption_to_update = by_lang.get(normalized_lang_lower)
     except HttpError as e:
         print(translator.get('youtube_api.list_captions_failed', reason=e.reason, T_WARN=T.WARN, E_WARN=E.WARN))
         return upload_caption(youtube, video_id, normalized_lang, file_path, translator)
@@ -131,8 +376,8 @@ def update_caption(youtube, video_id, language, file_path, translator, caption_i
         found_caption_id = caption_to_update['id']
         print(translator.get('youtube_api.found_existing_caption', caption_id=found_caption_id, T_INFO=T.INFO, E_INFO=E.INFO))
         try:
-            media_body = MediaFileUpload(file_path, chunksize=-1, resumable=True)
-            response = youtube.captions().update(part="snippet", body={'id': found_caption_id, 'snippet': {'isDraft': False}}, media_body=media_body).execute()
+            media_body = MediaFileUpload(file_path, chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
+            response = _drive_resumable(youtube.captions().update(part="snippet", body={'id': found_caption_id, 'snippet': {'isDraft': False}}, media_body=media_body), translator)
             increment_quota('captions.update', translator)
             print(translator.get('youtube_api.update_success', T_OK=T.OK, E_SUCCESS=E.SUCCESS))
             return response
@@ -147,6 +392,6 @@ def update_caption(youtube, video_id, language, file_path, translator, caption_i
 def delete_caption(youtube, caption_id, translator, is_update=False):
     message_prefix = "  " if is_update else ""
     print(translator.get('youtube_api.deleting_caption', caption_id=caption_id, T_INFO=T.INFO, E_TRASH=E.TRASH, message_prefix=message_prefix))
-    youtube.captions().delete(id=caption_id).execute()
+    execute_with_retry(youtube.captions().delete(id=caption_id), translator)
     increment_quota('captions.delete', translator)
     print(translator.get('youtube_api.delete_success', T_OK=T.OK, E_SUCCESS=E.SUCCESS, message_prefix=message_prefix))
\ No newline at end of file
@@ -16,9 +16,9 @@ def mock_translator():
     translator.get.side_effect = lambda key, **kwargs: key
     return translator
 
-@patch('src.file_handler.list_captions')
+@patch('src.file_handler.list_captions_batch')
 @patch('src.file_handler.get_channel_videos')
-def test_download_channel_captions_to_csv(mock_get_channel_videos, mock_list_captions, mock_youtube_api, tmp_path, mock_translator):
+def test_download_channel_captions_to_csv(mock_get_channel_videos, mock_list_captions_batch, mock_youtube_api, tmp_path, mock_translator):
     """
     Test downloading channel captions to a CSV file.
     """
@@ -32,10 +32,13 @@ def test_download_channel_captions_to_csv(mock_get_channel_videos, mock_list_cap
         {'id': 'video2', 'title': 'Test Video 2'}
     ]
 
-    mock_list_captions.side_effect = [
-        {'items': [{'id': 'caption1', 'snippet': {'language': 'en'}}]},
-        {'items': []}
-    ]
+    mock_list_captions_batch.return_value = (
+        {
+            'video1': {'items': [{'id': 'caption1', 'snippet': {'language': 'en'}}]},
+            'video2': {'items': []}
+        },
+        {}
+    )
 
     # Act
     os.chdir(tmp_path)
@@ -50,11 +53,11 @@ def test_download_channel_captions_to_csv(mock_get_channel_videos, mock_list_cap
     assert df.iloc[1]['video_id'] == 'video2'
 
     mock_get_channel_videos.assert_called_once_with(mock_youtube_api, channel_id, mock_translator)
-    assert mock_list_captions.call_count == 2
+    mock_list_captions_batch.assert_called_once_with(mock_youtube_api, ['video1', 'video2'], mock_translator)
 
-@patch('src.file_handler.list_captions')
+@patch('src.file_handler.list_captions_batch')
 @patch('src.file_handler.get_channel_videos')
-def test_generate_wide_report(mock_get_channel_videos, mock_list_captions, mock_youtube_api, tmp_path, mock_translator):
+def test_generate_wide_report(mock_get_channel_videos, mock_list_captions_batch, mock_youtube_api, tmp_path, mock_translator):
     """
     Test generating a wide format report of subtitle availability.
     """
@@ -68,10 +71,13 @@ def test_generate_wide_report(mock_get_channel_videos, mock_list_captions, mock_
         {'id': 'video2', 'title': 'Test Video 2'}
     ]
 
-    mock_list_captions.side_effect = [
-        {'items': [{'id': 'caption1_en', 'snippet': {'language': 'en'}}, {'id': 'caption1_fr', 'snippet': {'language': 'fr'}}]},
-        {'items': [{'id': 'caption2_en', 'snippet': {'language': 'en'}}]}
-    ]
+    mock_list_captions_batch.return_value = (
+        {
+            'video1': {'items': [{'id': 'caption1_en', 'snippet': {'language': 'en'}}, {'id': 'caption1_fr', 'snippet': {'language': 'fr'}}]},
+            'video2': {'items': [{'id': 'caption2_en', 'snippet': {'language': 'en'}}]}
+        },
+        {}
+    )
 
     # Act
     os.chdir(tmp_path)
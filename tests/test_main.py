@@ -77,9 +77,9 @@ def test_main_upload_command(mock_dependencies):
             mock_dependencies["youtube_service"], video_id, language, file_path, ANY
         )
 
-@patch('os.path.exists', return_value=True)
 @patch('os.access', return_value=True)
-def test_main_smart_upload_command(mock_access, mock_exists, mock_dependencies):
+@patch('os.stat')
+def test_main_smart_upload_command(mock_stat, mock_access, mock_dependencies):
     """
     Test the 'smart-upload' command.
     """
@@ -16,11 +16,12 @@ def mock_translator():
     translator.get.side_effect = lambda key, **kwargs: key
     return translator
 
+@patch('os.replace')
 @patch('src.file_handler.get_channel_videos')
-@patch('src.file_handler.list_captions')
+@patch('src.file_handler.list_captions_batch')
 @patch('os.makedirs')
 @patch('os.path.exists', return_value=False)
-def test_create_project_success(mock_exists, mock_makedirs, mock_list_captions, mock_get_channel_videos, mock_youtube_api, mock_translator):
+def test_create_project_success(mock_exists, mock_makedirs, mock_list_captions_batch, mock_get_channel_videos, mock_replace, mock_youtube_api, mock_translator):
     """
     Test the successful creation of a new project.
     """
@@ -33,17 +34,18 @@ def test_create_project_success(mock_exists, mock_makedirs, mock_list_captions,
         {'id': 'video2', 'title': 'Test Video 2'}
     ]
 
-    mock_list_captions.side_effect = [
+    mock_list_captions_batch.return_value = (
         {
-            'items': [
-                {'id': 'caption1_en', 'snippet': {'language': 'en', 'lastUpdated': '2023-01-01T00:00:00Z', 'isDraft': False}},
-                {'id': 'caption1_fr', 'snippet': {'language': 'fr', 'lastUpdated': '2023-01-02T00:00:00Z', 'isDraft': False}}
-            ]
+            'video1': {
+                'items': [
+                    {'id': 'caption1_en', 'snippet': {'language': 'en', 'lastUpdated': '2023-01-01T00:00:00Z', 'isDraft': False}},
+                    {'id': 'caption1_fr', 'snippet': {'language': 'fr', 'lastUpdated': '2023-01-02T00:00:00Z', 'isDraft': False}}
+                ]
+            },
+            'video2': {'items': []}
         },
-        {
-            'items': []
-        }
-    ]
+        {}
+    )
 
     # Act
     with patch('builtins.open', mock_open()) as mock_file:
@@ -54,12 +56,13 @@ def test_create_project_success(mock_exists, mock_makedirs, mock_list_captions,
     subtitles_json_path = os.path.join(project_path, "subtitles.json")
 
     mock_makedirs.assert_called_once_with(project_path, exist_ok=True)
-    mock_file.assert_called_once_with(subtitles_json_path, 'w', encoding='utf-8')
+    mock_file.assert_called_once_with(f"{subtitles_json_path}.tmp", 'wb')
+    mock_replace.assert_called_once_with(f"{subtitles_json_path}.tmp", subtitles_json_path)
 
     mock_get_channel_videos.assert_called_once_with(mock_youtube_api, channel_id, mock_translator)
-    assert mock_list_captions.call_count == 2
+    mock_list_captions_batch.assert_called_once_with(mock_youtube_api, ['video1', 'video2'], mock_translator)
 
-    written_content = "".join(c.args[0] for c in mock_file().write.call_args_list)
+    written_content = b"".join(c.args[0] for c in mock_file().write.call_args_list)
     written_data = json.loads(written_content)
 
     assert 'video1' in written_data
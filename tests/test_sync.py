@@ -17,13 +17,14 @@ def mock_translator():
     translator.get.side_effect = lambda key, **kwargs: key
     return translator
 
+@patch('os.replace')
 @patch('src.file_handler.upload_caption')
 @patch('src.file_handler.update_caption')
 @patch('src.file_handler.delete_caption')
 @patch('os.path.exists')
 @patch('os.walk')
 @patch('builtins.open', new_callable=mock_open)
-def test_sync_new_structure_new_file_upload(mock_open_file, mock_walk, mock_exists, mock_delete, mock_update, mock_upload, mock_youtube_api, mock_translator):
+def test_sync_new_structure_new_file_upload(mock_open_file, mock_walk, mock_exists, mock_delete, mock_update, mock_upload, mock_replace, mock_youtube_api, mock_translator):
     """
     Test that a new local file in the new folder structure is correctly uploaded.
     """
@@ -54,12 +55,13 @@ def test_sync_new_structure_new_file_upload(mock_open_file, mock_walk, mock_exis
     mock_update.assert_not_called()
     mock_delete.assert_not_called()
 
-    written_content = "".join(c.args[0] for c in mock_open_file().write.call_args_list)
+    written_content = b"".join(c.args[0] for c in mock_open_file().write.call_args_list)
     final_project_data = json.loads(written_content)
 
     assert final_project_data['video1']['subtitles']['en']['status'] == 'synced'
     assert final_project_data['video1']['subtitles']['en']['caption_id'] == 'new_caption_id'
 
+@patch('os.replace')
 @patch('src.file_handler.upload_caption')
 @patch('src.file_handler.update_caption')
 @patch('src.file_handler.delete_caption')
@@ -67,7 +69,7 @@ def test_sync_new_structure_new_file_upload(mock_open_file, mock_walk, mock_exis
 @patch('os.walk')
 @patch('os.path.getmtime')
 @patch('builtins.open', new_callable=mock_open)
-def test_sync_new_structure_modified_file_update(mock_open_file, mock_getmtime, mock_walk, mock_exists, mock_delete, mock_update, mock_upload, mock_youtube_api, mock_translator):
+def test_sync_new_structure_modified_file_update(mock_open_file, mock_getmtime, mock_walk, mock_exists, mock_delete, mock_update, mock_upload, mock_replace, mock_youtube_api, mock_translator):
     """
     Test that a modified local file in the new folder structure is correctly updated.
     """
@@ -107,13 +109,14 @@ def test_sync_new_structure_modified_file_update(mock_open_file, mock_getmtime,
     mock_upload.assert_not_called()
     mock_delete.assert_not_called()
 
+@patch('os.replace')
 @patch('src.file_handler.upload_caption')
 @patch('src.file_handler.update_caption')
 @patch('src.file_handler.delete_caption')
 @patch('os.path.exists')
 @patch('os.walk')
 @patch('builtins.open', new_callable=mock_open)
-def test_sync_flat_structure_backward_compatibility(mock_open_file, mock_walk, mock_exists, mock_delete, mock_update, mock_upload, mock_youtube_api, mock_translator):
+def test_sync_flat_structure_backward_compatibility(mock_open_file, mock_walk, mock_exists, mock_delete, mock_update, mock_upload, mock_replace, mock_youtube_api, mock_translator):
     """
     Test that a new local file in the old flat structure is correctly uploaded for backward compatibility.
     """
@@ -138,13 +141,14 @@ def test_sync_flat_structure_backward_compatibility(mock_open_file, mock_walk, m
     # Assert
     mock_upload.assert_called_once_with(mock_youtube_api, 'video1', 'en', ANY, mock_translator)
 
+@patch('os.replace')
 @patch('src.file_handler.upload_caption')
 @patch('src.file_handler.update_caption')
 @patch('src.file_handler.delete_caption')
 @patch('os.path.exists')
 @patch('os.walk')
 @patch('builtins.open', new_callable=mock_open)
-def test_sync_project_deleted_file(mock_open_file, mock_walk, mock_exists, mock_delete, mock_update, mock_upload, mock_youtube_api, mock_translator):
+def test_sync_project_deleted_file(mock_open_file, mock_walk, mock_exists, mock_delete, mock_update, mock_upload, mock_replace, mock_youtube_api, mock_translator):
     """
     Test that a deleted local file results in the remote caption being deleted.
     """
@@ -176,7 +180,7 @@ def test_sync_project_deleted_file(mock_open_file, mock_walk, mock_exists, mock_
     mock_upload.assert_not_called()
     mock_update.assert_not_called()
 
-    written_content = "".join(c.args[0] for c in mock_open_file().write.call_args_list)
+    written_content = b"".join(c.args[0] for c in mock_open_file().write.call_args_list)
     final_project_data = json.loads(written_content)
 
     assert 'en' not in final_project_data['video1']['subtitles']
\ No newline at end of file
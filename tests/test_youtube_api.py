@@ -1,6 +1,12 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from src.youtube_api import get_channel_videos, upload_caption, update_caption, delete_caption
+from googleapiclient.errors import HttpError
+from src.youtube_api import execute_with_retry, get_channel_videos, list_captions_batch, upload_caption, update_caption, delete_caption
+
+def make_http_error(status):
+    """Builds an HttpError with the given HTTP status for tests."""
+    resp = MagicMock(status=status, reason='error')
+    return HttpError(resp, b'error')
 
 @pytest.fixture
 def mock_youtube_api():
@@ -16,7 +22,8 @@ def mock_translator():
 
 def test_get_channel_videos_pagination(mock_youtube_api, mock_translator):
     """
-    Test that get_channel_videos correctly handles pagination.
+    Test that get_channel_videos correctly handles pagination and flags
+    caption-less videos from the videos.list content details.
     """
     # Arrange
     channel_id = "UC1234567890"
@@ -25,6 +32,14 @@ def test_get_channel_videos_pagination(mock_youtube_api, mock_translator):
         'items': [{'contentDetails': {'relatedPlaylists': {'uploads': 'PL1234567890'}}}]
     }
 
+    mock_youtube_api.videos.return_value.list.return_value.execute.return_value = {
+        'items': [
+            {'id': 'video1', 'contentDetails': {'caption': 'true'}},
+            {'id': 'video2', 'contentDetails': {'caption': 'false'}},
+            {'id': 'video3', 'contentDetails': {'caption': 'true'}}
+        ]
+    }
+
     mock_youtube_api.playlistItems.return_value.list.return_value.execute.side_effect = [
         {
             'items': [
@@ -47,7 +62,97 @@ def test_get_channel_videos_pagination(mock_youtube_api, mock_translator):
     assert len(videos) == 3
     assert videos[0]['id'] == 'video1'
     assert videos[2]['id'] == 'video3'
+    assert videos[0]['has_captions'] is True
+    assert videos[1]['has_captions'] is False
     assert mock_youtube_api.playlistItems.return_value.list.call_count == 2
+    assert mock_youtube_api.videos.return_value.list.call_count == 1
+
+@patch('src.youtube_api.time.sleep')
+def test_execute_with_retry_transient_error(mock_sleep, mock_translator):
+    """
+    Test that transient HTTP errors are retried and the eventual response returned.
+    """
+    # Arrange
+    request = MagicMock()
+    request.execute.side_effect = [make_http_error(503), make_http_error(429), {'items': []}]
+
+    # Act
+    response = execute_with_retry(request, mock_translator)
+
+    # Assert
+    assert response == {'items': []}
+    assert request.execute.call_count == 3
+    assert mock_sleep.call_count == 2
+
+@patch('src.youtube_api.time.sleep')
+def test_execute_with_retry_non_retryable_error(mock_sleep, mock_translator):
+    """
+    Test that non-retryable HTTP errors propagate immediately.
+    """
+    # Arrange
+    request = MagicMock()
+    request.execute.side_effect = make_http_error(404)
+
+    # Act / Assert
+    with pytest.raises(HttpError):
+        execute_with_retry(request, mock_translator)
+    assert request.execute.call_count == 1
+    mock_sleep.assert_not_called()
+
+@patch('src.youtube_api.save_to_cache')
+@patch('src.youtube_api.get_from_cache', return_value=None)
+def test_list_captions_batch(mock_get_from_cache, mock_save_to_cache, mock_youtube_api, mock_translator):
+    """
+    Test that list_captions_batch collects per-video responses and errors
+    through the batch callback.
+    """
+    # Arrange
+    caption_items = {
+        'video1': {'items': [{'id': 'caption1', 'snippet': {'language': 'en'}}]},
+        'video2': {'items': []}
+    }
+    fake_error = MagicMock(code=404, reason='Not Found')
+
+    def fake_new_batch_http_request(callback):
+        batch = MagicMock()
+        added = []
+        batch.add.side_effect = lambda request, request_id: added.append(request_id)
+
+        def execute():
+            for request_id in added:
+                if request_id == 'video3':
+                    callback(request_id, None, fake_error)
+                else:
+                    callback(request_id, caption_items[request_id], None)
+        batch.execute.side_effect = execute
+        return batch
+
+    mock_youtube_api.new_batch_http_request.side_effect = fake_new_batch_http_request
+
+    # Act
+    responses, errors = list_captions_batch(mock_youtube_api, ['video1', 'video2', 'video3'], mock_translator)
+
+    # Assert
+    assert responses == caption_items
+    assert errors == {'video3': fake_error}
+    assert mock_youtube_api.captions.return_value.list.call_count == 3
+
+@patch('src.youtube_api.get_from_cache')
+def test_list_captions_batch_cache_hit(mock_get_from_cache, mock_youtube_api, mock_translator):
+    """
+    Test that cached caption lists are served from disk without issuing a batch request.
+    """
+    # Arrange
+    cached_response = {'items': [{'id': 'caption1', 'snippet': {'language': 'en'}}]}
+    mock_get_from_cache.return_value = cached_response
+
+    # Act
+    responses, errors = list_captions_batch(mock_youtube_api, ['video1'], mock_translator)
+
+    # Assert
+    assert responses == {'video1': cached_response}
+    assert errors == {}
+    mock_youtube_api.new_batch_http_request.assert_not_called()
 
 @patch('src.youtube_api.MediaFileUpload')
 def test_upload_caption(mock_media_file_upload, mock_youtube_api, mock_translator):
@@ -59,15 +164,15 @@ def test_upload_caption(mock_media_file_upload, mock_youtube_api, mock_translato
     language = "en"
     file_path = "/path/to/caption.srt"
 
-    mock_youtube_api.captions.return_value.insert.return_value.execute.return_value = {
-        'id': 'new_caption_id'
-    }
+    mock_youtube_api.captions.return_value.insert.return_value.next_chunk.return_value = (
+        None, {'id': 'new_caption_id'}
+    )
 
     # Act
     upload_caption(mock_youtube_api, video_id, language, file_path, mock_translator)
 
     # Assert
-    mock_media_file_upload.assert_called_once_with(file_path, chunksize=-1, resumable=True)
+    mock_media_file_upload.assert_called_once_with(file_path, chunksize=4 * 1024 * 1024, resumable=True)
     mock_youtube_api.captions.return_value.insert.assert_called_once()
 
     _, kwargs = mock_youtube_api.captions.return_value.insert.call_args
@@ -85,11 +190,15 @@ def test_update_caption_with_id(mock_media_file_upload, mock_youtube_api, mock_t
     file_path = "/path/to/caption.srt"
     caption_id = "existing_caption_id"
 
+    mock_youtube_api.captions.return_value.update.return_value.next_chunk.return_value = (
+        None, {'id': caption_id}
+    )
+
     # Act
     update_caption(mock_youtube_api, video_id, language, file_path, mock_translator, caption_id=caption_id)
 
     # Assert
-    mock_media_file_upload.assert_called_once_with(file_path, chunksize=-1, resumable=True)
+    mock_media_file_upload.assert_called_once_with(file_path, chunksize=4 * 1024 * 1024, resumable=True)
     mock_youtube_api.captions.return_value.update.assert_called_once()
 
     _, kwargs = mock_youtube_api.captions.return_value.update.call_args
@@ -110,6 +219,9 @@ def test_update_caption_no_id_found_by_lang(mock_upload_caption, mock_media_file
     mock_list_captions.return_value = {
         'items': [{'id': 'found_caption_id', 'snippet': {'language': 'en'}}]
     }
+    mock_youtube_api.captions.return_value.update.return_value.next_chunk.return_value = (
+        None, {'id': 'found_caption_id'}
+    )
 
     # Act
     update_caption(mock_youtube_api, video_id, language, file_path, mock_translator, caption_id=None)